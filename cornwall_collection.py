@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import contextlib
+import json
 import logging
 import os
+import stat
 import sys
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
 
 # Configuration constants
 TITLE = "Cornwall Council"
@@ -15,18 +23,54 @@ DESCRIPTION = "Source for cornwall.gov.uk services for Cornwall Council"
 URL = "https://cornwall.gov.uk"
 USER_AGENT = "Cornwall-Waste-Calendar-Generator/1.0"
 REQUEST_TIMEOUT = 10
+MAX_CONCURRENT_REQUESTS = 4
+CHUNK_SIZE = 8192
 OUTPUT_FILENAME = "cornwall_collection.ics"
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cornwall")
 
 SEARCH_URLS = {
     "uprn_search": "https://www.cornwall.gov.uk/my-area/",
     "collection_search": "https://www.cornwall.gov.uk/umbraco/Surface/Waste/MyCollectionDays?subscribe=False",
 }
+
+# Month abbreviations as shown on the collections page, e.g. "15 Jan"
+_MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+# Compiled once at import and reused for every collection div
+_SPAN_XPATH = etree.XPath(".//span")
+
 ICON_MAP = {
     "Rubbish": "mdi:delete",
     "Recycling": "mdi:recycle",
     "Garden": "mdi:flower",
 }
 
+# Fixed parts of the generated iCalendar document
+_ICS_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    f"PRODID:-//{TITLE}//Waste Collection//EN\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:PUBLISH\r\n"
+)
+_ICS_FOOTER = "END:VCALENDAR\r\n"
+_ICS_DATE_FMT = "%Y%m%d"
+_DTSTAMP_FMT = "%Y%m%dT%H%M%SZ"
+_ONE_DAY = timedelta(days=1)
+
 # Map the council's shorthand names to user-friendly summaries
 NAME_MAP = {
     "Food": "Food Waste Collection",
@@ -35,6 +79,9 @@ NAME_MAP = {
     "Garden": "Garden Waste Collection",
 }
 
+# UID-safe forms of the summaries above, with spaces removed
+_UID_TYPE = {name: name.replace(" ", "") for name in NAME_MAP.values()}
+
 # Environment variable names to toggle individual collections. By default all
 # events are created unless a value evaluates to ``false``.
 INCLUDE_VARS = {
@@ -43,6 +90,7 @@ INCLUDE_VARS = {
     "Rubbish Recycling": "INCLUDE_RUBBISH",
     "Garden Waste Collection": "INCLUDE_GARDEN",
 }
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
 
 # Configure logging
 logging.basicConfig(
@@ -53,16 +101,69 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def _is_enabled(collection_name: str) -> bool:
-    """Return ``True`` if the given collection should be included."""
-    env_var = INCLUDE_VARS.get(collection_name)
-    value = os.getenv(env_var) if env_var else None
+def _create_session() -> requests.Session:
+    """Create the HTTP session shared by all requests to the council website.
+
+    Both lookups go to the same host, so reusing one pooled keep-alive
+    connection avoids a second TCP/TLS handshake per run.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+_SESSION = _create_session()
+
+
+def _lxml_encoding(label: str | None) -> str | None:
+    """Return a charset label unchanged if lxml can decode with it, else ``None``."""
+    if not label:
+        return None
+    try:
+        etree.HTMLParser(encoding=label)
+    except LookupError:
+        logger.debug("Ignoring charset unknown to lxml: %s", label)
+        return None
+    return label
+
+
+def _declared_encoding(headers: Mapping[str, str]) -> str | None:
+    """Return the charset declared in a response's ``Content-Type`` header.
+
+    ``None`` is returned when no charset is given, or when lxml does not
+    recognise it. lxml then detects the encoding from the page's ``<meta>`` tag.
+    """
+    if "charset" not in headers.get("Content-Type", "").lower():
+        return None
+    return _lxml_encoding(requests.utils.get_encoding_from_headers(headers))
+
+
+def _env_true(env_var: str) -> bool:
+    """Return ``True`` unless the variable is set to a value other than true."""
+    value = os.getenv(env_var)
     if not value:
         return True
-    return value.strip().lower() in {"1", "true", "yes", "on"}
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def _disabled_collections() -> frozenset[str]:
+    """Return the names of collections switched off by their INCLUDE_* variable.
+
+    The environment is read once, so filtering each collection afterwards only
+    needs a set lookup.
+    """
+    return frozenset(
+        name for name, env_var in INCLUDE_VARS.items() if not _env_true(env_var)
+    )
+
+
+# dataclass() only accepts ``slots`` from Python 3.10 onwards
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Collection:
     """Represents a single waste collection event.
 
@@ -125,42 +226,6 @@ class Source:
         self._postcode = postcode
         self._housenumberorname = str(housenumberorname) if housenumberorname else None
 
-    def _parse_collection_date(self, date_str: str) -> date:
-        """Parse a collection date string, handling year boundaries correctly.
-
-        The website returns dates in format "DD Mon" without year. We need to infer
-        the year, accounting for the case where we're in December and the date shown
-        is in January (next year) or vice versa.
-
-        Args:
-            date_str: Date string in format "DD Mon" (e.g., "15 Jan").
-
-        Returns:
-            A date object representing the collection date.
-        """
-        today = date.today()
-        current_month = today.month
-        current_year = today.year
-
-        # Parse with current year first
-        parsed_date = datetime.strptime(f"{date_str} {current_year}", "%d %b %Y").date()
-
-        # If we're in December (month 12) and the parsed date is in January/February (months 1-2),
-        # the date is likely in the next year
-        if current_month == 12 and parsed_date.month <= 2:
-            parsed_date = datetime.strptime(
-                f"{date_str} {current_year + 1}", "%d %b %Y"
-            ).date()
-        # If we're in January (month 1) and the parsed date is in December (month 12),
-        # the date might be from last year (though this is less common for future collections)
-        elif current_month == 1 and parsed_date.month == 12:
-            if parsed_date < today:
-                parsed_date = datetime.strptime(
-                    f"{date_str} {current_year - 1}", "%d %b %Y"
-                ).date()
-
-        return parsed_date
-
     def fetch(self) -> list[Collection]:
         """Fetch waste collection dates from Cornwall Council website.
 
@@ -173,127 +238,437 @@ class Source:
                 match but similar addresses exist.
             requests.HTTPError: If the HTTP request fails.
         """
-        entries: list[Collection] = []
-        headers = {"User-Agent": USER_AGENT}
+        # Find the UPRN based on the postcode and the property name/number
+        if self._uprn is None:
+            if not self._postcode:
+                raise ValueError(
+                    "Either UPRN or POSTCODE must be provided"
+                )
 
-        with requests.Session() as session:
-            session.headers.update(headers)
+            logger.info(
+                "Looking up UPRN for postcode: %s, house: %s",
+                self._postcode,
+                self._housenumberorname,
+            )
+            args = {"Postcode": self._postcode}
+            r = _SESSION.get(
+                SEARCH_URLS["uprn_search"], params=args, timeout=REQUEST_TIMEOUT
+            )
+            r.raise_for_status()
+            try:
+                parser = lxml_html.HTMLParser(encoding=_declared_encoding(r.headers))
+                tree = lxml_html.fromstring(r.content, parser=parser)
+            except etree.ParserError as exc:
+                # An empty page has no address list either
+                raise SourceArgumentNotFound("postcode", str(self._postcode)) from exc
+            uprn_elements = tree.xpath('//*[@id="Uprn"]')
+            if not uprn_elements:
+                raise SourceArgumentNotFound("postcode", str(self._postcode))
+
+            # Read each option's address and UPRN once; the addresses double
+            # as suggestions if nothing matches.
+            property_uprns = [
+                (option.text_content(), option.get("value"))
+                for option in uprn_elements[0].xpath(".//option")
+            ]
+            if len(property_uprns) == 0:
+                raise SourceArgumentNotFound("postcode", str(self._postcode))
+
+            needle = self._housenumberorname or ""
+            for address, uprn in property_uprns:
+                if address.startswith(needle):
+                    self._uprn = uprn
+                    break
 
-            # Find the UPRN based on the postcode and the property name/number
             if self._uprn is None:
-                if not self._postcode:
-                    raise ValueError(
-                        "Either UPRN or POSTCODE must be provided"
-                    )
-
-                logger.info(
-                    "Looking up UPRN for postcode: %s, house: %s",
-                    self._postcode,
-                    self._housenumberorname,
+                raise SourceArgumentNotFoundWithSuggestions(
+                    "housenumberorname",
+                    needle,
+                    [address for address, _ in property_uprns],
                 )
-                args = {"Postcode": self._postcode}
-                r = session.get(
-                    SEARCH_URLS["uprn_search"], params=args, timeout=REQUEST_TIMEOUT
+            logger.info("Found UPRN: %s", self._uprn)
+
+        # Get the collection days based on the UPRN
+        return fetch_by_uprn(self._uprn)
+
+
+def _cacheable(uprn: str) -> bool:
+    """Return ``True`` if a UPRN is safe to use as a cache file name.
+
+    UPRNs are numeric. Anything else, such as a value containing path
+    separators, is not cached so it cannot write outside ``CACHE_DIR``.
+    """
+    return uprn.isascii() and uprn.isdigit()
+
+
+def _cache_path(uprn: str, extension: str) -> str:
+    """Return the path of a cache file for a UPRN's collection page."""
+    return os.path.join(CACHE_DIR, f"{uprn}.{extension}")
+
+
+def _load_cached_page(uprn: str) -> tuple[dict[str, str | None], bytes] | None:
+    """Load a previously cached collection page, if there is a usable one.
+
+    Returns:
+        The page's validators and its raw body, or ``None`` if nothing usable
+        is cached.
+    """
+    if not _cacheable(uprn):
+        return None
+    try:
+        with open(_cache_path(uprn, "json"), encoding="utf-8") as f:
+            validators = json.load(f)
+        with open(_cache_path(uprn, "html"), "rb") as f:
+            body = f.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.debug("Ignoring unreadable cache for UPRN %s: %s", uprn, exc)
+        return None
+    if not isinstance(validators, dict):
+        return None
+    return validators, body
+
+
+def _store_cached_page(
+    uprn: str,
+    etag: str | None,
+    last_modified: str | None,
+    encoding: str | None,
+    body: bytes,
+) -> None:
+    """Cache a collection page along with its validators for conditional GETs.
+
+    The body is kept as the raw bytes received, so a cached page is decoded
+    exactly like a freshly downloaded one. The validators are written last, so
+    they never refer to a body that failed to save.
+    """
+    if not _cacheable(uprn):
+        logger.debug("Not caching collection page for UPRN %r", uprn)
+        return
+    validators = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "encoding": encoding,
+    }
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(uprn, "html"), "wb") as f:
+            f.write(body)
+        with open(_cache_path(uprn, "json"), "w", encoding="utf-8") as f:
+            json.dump(validators, f)
+    except OSError as exc:
+        logger.debug("Unable to cache collection page for UPRN %s: %s", uprn, exc)
+
+
+def _open_collection_page(
+    uprn: str, session: requests.Session = _SESSION
+) -> tuple[str | None, Iterator[bytes]]:
+    """Request the collection days page for a UPRN and stream its body.
+
+    The last copy of each page is cached on disk together with its ``ETag`` and
+    ``Last-Modified`` headers. These are sent back as a conditional request, and
+    the cached copy is used when the council responds ``304 Not Modified``.
+
+    Returns:
+        The charset declared for the page, if any, and an iterator over the
+        page body in chunks as they are received.
+
+    Raises:
+        requests.HTTPError: If the HTTP request fails, or the council responds
+            ``304 Not Modified`` when there is no cached copy.
+    """
+    cached = _load_cached_page(uprn)
+    headers = {}
+    if cached is not None:
+        validators, _ = cached
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    r = session.get(
+        SEARCH_URLS["collection_search"],
+        params={"uprn": uprn},
+        headers=headers,
+        stream=True,
+        timeout=REQUEST_TIMEOUT,
+    )
+    if r.status_code == 304 and cached is not None:
+        r.close()
+        logger.info("Collection page for UPRN %s is unchanged, using cache", uprn)
+        validators, body = cached
+        return _lxml_encoding(validators.get("encoding")), iter((body,))
+    try:
+        if r.status_code == 304:
+            # No conditional headers were sent, so there is no body to reuse
+            raise requests.HTTPError(
+                f"304 Not Modified for UPRN {uprn} without a cached copy",
+                response=r,
+            )
+        r.raise_for_status()
+        encoding = _declared_encoding(r.headers)
+    except BaseException:
+        # The body iterator has not started, so its ``with r:`` cannot close r
+        r.close()
+        raise
+
+    return encoding, _iter_response_body(uprn, r)
+
+
+def _iter_response_body(uprn: str, r: requests.Response) -> Iterator[bytes]:
+    """Yield a streamed collection page, caching it if it can be revalidated."""
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    # Only keep a copy of the body when it can be revalidated later
+    body: list[bytes] | None = [] if etag or last_modified else None
+    with r:
+        for chunk in r.iter_content(CHUNK_SIZE):
+            if body is not None:
+                body.append(chunk)
+            yield chunk
+
+    if body is not None:
+        encoding = _declared_encoding(r.headers)
+        _store_cached_page(uprn, etag, last_modified, encoding, b"".join(body))
+
+
+def _parse_collection_date(date_str: str) -> date:
+    """Parse a collection date string, handling year boundaries correctly.
+
+    The website returns dates in format "DD Mon" without year. We need to infer
+    the year, accounting for the case where we're in December and the date shown
+    is in January (next year) or vice versa.
+
+    Args:
+        date_str: Date string in format "DD Mon" (e.g., "15 Jan").
+
+    Returns:
+        A date object representing the collection date.
+    """
+    parts = date_str.split()
+    if len(parts) != 2:
+        raise ValueError(f"Unrecognised collection date: {date_str!r}")
+    day_str, month_str = parts
+    month = _MONTHS.get(month_str.lower())
+    if month is None or not day_str.isdigit():
+        raise ValueError(f"Unrecognised collection date: {date_str!r}")
+    day = int(day_str)
+
+    today = date.today()
+    current_month = today.month
+    current_year = today.year
+
+    # If we're in December (month 12) and the date is in January/February (months 1-2),
+    # the date is likely in the next year
+    if current_month == 12 and month <= 2:
+        return date(current_year + 1, month, day)
+
+    parsed_date = date(current_year, month, day)
+    # If we're in January (month 1) and the parsed date is in December (month 12),
+    # the date might be from last year (though this is less common for future collections)
+    if current_month == 1 and month == 12 and parsed_date < today:
+        parsed_date = date(current_year - 1, month, day)
+
+    return parsed_date
+
+
+def _parse_collections(
+    chunks: Iterable[bytes], encoding: str | None = None
+) -> list[Collection]:
+    """Extract the collections listed on a collection days page.
+
+    The page is parsed incrementally as chunks arrive, so parsing overlaps
+    with the download. The contents of each collection div are cleared once
+    it has been read; the rest of the document stays in the tree.
+
+    Args:
+        chunks: The HTML of the collection days page, in pieces.
+        encoding: Charset declared for the page; detected by lxml if ``None``.
+
+    Returns:
+        A list of Collection objects; entries with unparseable dates are
+        logged and skipped.
+    """
+    entries: list[Collection] = []
+    parser = etree.HTMLPullParser(events=("end",), tag="div", encoding=encoding)
+    parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+    for chunk in chunks:
+        parser.feed(chunk)
+        _read_collection_divs(parser, entries)
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        # Raised for an empty page, which simply lists no collections
+        pass
+    _read_collection_divs(parser, entries)
+
+    return entries
+
+
+def _read_collection_divs(
+    parser: etree.HTMLPullParser, entries: list[Collection]
+) -> None:
+    """Append the collections from divs the parser has finished reading."""
+    for _, collection_div in parser.read_events():
+        if "collection" not in (collection_div.get("class") or "").split():
+            continue
+        spans = _SPAN_XPATH(collection_div)
+        if not spans:
+            collection_div.clear()
+            continue
+        collection = spans[0].text_content().strip()
+        date_str = spans[-1].text_content().strip()
+        # Drop the div's subtree now that its text has been read
+        collection_div.clear()
+        name = NAME_MAP.get(collection, collection)
+
+        try:
+            collection_date = _parse_collection_date(date_str)
+            entries.append(
+                Collection(
+                    collection_date,
+                    name,
+                    icon=ICON_MAP.get(collection),
                 )
-                r.raise_for_status()
-                soup = BeautifulSoup(r.text, features="html.parser")
-                uprn_element = soup.find(id="Uprn")
-                if uprn_element is None:
-                    raise SourceArgumentNotFound("postcode", str(self._postcode))
-
-                property_uprns = uprn_element.find_all("option")
-                if len(property_uprns) == 0:
-                    raise SourceArgumentNotFound("postcode", str(self._postcode))
-
-                for match in property_uprns:
-                    if match.text.startswith(self._housenumberorname or ""):
-                        self._uprn = match["value"]
-                        break
-
-                if self._uprn is None:
-                    raise SourceArgumentNotFoundWithSuggestions(
-                        "housenumberorname",
-                        self._housenumberorname or "",
-                        [match.text for match in property_uprns],
-                    )
-                logger.info("Found UPRN: %s", self._uprn)
-
-            # Get the collection days based on the UPRN
-            logger.info("Fetching collection dates for UPRN: %s", self._uprn)
-            args = {"uprn": self._uprn}
-            r = session.get(
-                SEARCH_URLS["collection_search"], params=args, timeout=REQUEST_TIMEOUT
             )
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, features="html.parser")
-
-            for collection_div in soup.find_all("div", class_="collection"):
-                spans = collection_div.find_all("span")
-                if not spans:
-                    continue
-                collection = spans[0].text.strip()
-                date_str = spans[-1].text.strip()
-                name = NAME_MAP.get(collection, collection)
-
-                try:
-                    collection_date = self._parse_collection_date(date_str)
-                    entries.append(
-                        Collection(
-                            collection_date,
-                            name,
-                            icon=ICON_MAP.get(collection),
-                        )
-                    )
-                except ValueError as e:
-                    logger.warning(
-                        "Failed to parse date '%s' for collection '%s': %s",
-                        date_str,
-                        collection,
-                        e,
-                    )
-                    continue
-
-            logger.info("Found %d collection entries", len(entries))
-
-        return entries
-
-
-def _build_ics(collections: list[Collection]) -> str:
-    """Create an iCalendar file for the provided collections."""
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        f"PRODID:-//{TITLE}//Waste Collection//EN",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-    ]
-    dtstamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        except ValueError as e:
+            logger.warning(
+                "Failed to parse date '%s' for collection '%s': %s",
+                date_str,
+                collection,
+                e,
+            )
+
+
+def fetch_by_uprn(uprn: str, session: requests.Session = _SESSION) -> list[Collection]:
+    """Fetch waste collection dates for a property with a known UPRN.
+
+    This is the whole lookup when the UPRN is already configured; only the
+    collection days page needs to be requested.
+
+    Args:
+        uprn: Unique Property Reference Number of the property.
+        session: HTTP session to send the request with (default: shared session).
+
+    Returns:
+        A list of Collection objects representing upcoming waste collections.
+
+    Raises:
+        requests.HTTPError: If the HTTP request fails.
+    """
+    logger.info("Fetching collection dates for UPRN: %s", uprn)
+    encoding, chunks = _open_collection_page(uprn, session)
+    entries = _parse_collections(chunks, encoding)
+    logger.info("Found %d collection entries", len(entries))
+    return entries
+
+
+def fetch_many(uprns: list[str]) -> dict[str, list[Collection]]:
+    """Fetch waste collection dates for several properties concurrently.
+
+    Each collection page is requested and parsed on a worker thread, sharing
+    the pooled session. A UPRN listed more than once is only fetched once, so
+    no two workers write the same cache files.
+
+    Args:
+        uprns: Unique Property Reference Numbers to look up.
+
+    Returns:
+        A mapping of each UPRN to its list of Collection objects, in the
+        order the UPRNs were first given.
+
+    Raises:
+        requests.HTTPError: If any of the HTTP requests fail.
+    """
+    unique_uprns = list(dict.fromkeys(uprns))
+    results: dict[str, list[Collection]] = {}
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        futures = {executor.submit(fetch_by_uprn, uprn): uprn for uprn in unique_uprns}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return {uprn: results[uprn] for uprn in unique_uprns}
+
+
+def _build_ics(collections: Iterable[Collection]) -> Iterator[str]:
+    """Generate an iCalendar document for the provided collections.
+
+    The document is yielded piece by piece: the calendar header, one
+    CRLF-terminated VEVENT per collection and then the footer.
+    """
+    dtstamp = datetime.now(timezone.utc).strftime(_DTSTAMP_FMT)
+    yield _ICS_HEADER
     for c in collections:
-        lines.extend(
-            [
-                "BEGIN:VEVENT",
-                f"UID:{c.date:%Y%m%d}-{c.type.replace(' ', '')}@{URL}",
-                f"SUMMARY:{c.type}",
-                f"DTSTAMP:{dtstamp}",
-                f"DTSTART;VALUE=DATE:{c.date:%Y%m%d}",
-                f"DTEND;VALUE=DATE:{(c.date + timedelta(days=1)):%Y%m%d}",
-                "END:VEVENT",
-            ]
+        start = c.date.strftime(_ICS_DATE_FMT)
+        end = (c.date + _ONE_DAY).strftime(_ICS_DATE_FMT)
+        uid_type = _UID_TYPE.get(c.type) or c.type.replace(" ", "")
+        yield (
+            f"BEGIN:VEVENT\r\n"
+            f"UID:{start}-{uid_type}@{URL}\r\n"
+            f"SUMMARY:{c.type}\r\n"
+            f"DTSTAMP:{dtstamp}\r\n"
+            f"DTSTART;VALUE=DATE:{start}\r\n"
+            f"DTEND;VALUE=DATE:{end}\r\n"
+            f"END:VEVENT\r\n"
         )
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines) + "\r\n"
+    yield _ICS_FOOTER
+
+
+def _copy_file_permissions(target: str, tmp_path: str) -> None:
+    """Give a replacement file the mode and owner of the file it replaces.
+
+    mkstemp creates files readable only by their owner. An existing target's
+    mode (and owner, where permitted) is kept. A new file gets the default
+    ``0o666`` less the process umask, as ``open()`` would give it.
+    """
+    try:
+        st = os.stat(target)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        return
+    os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+    if hasattr(os, "chown"):
+        with contextlib.suppress(OSError):
+            os.chown(tmp_path, st.st_uid, st.st_gid)
 
 
-def write_ics_file(collections: list[Collection], filename: str = OUTPUT_FILENAME) -> None:
+def write_ics_file(
+    collections: Iterable[Collection], filename: str = OUTPUT_FILENAME
+) -> None:
     """Write collections to an iCalendar file.
 
+    The collections are consumed once, and the whole document is built before
+    the file is touched. An existing file is only replaced once the new
+    calendar has been written in full.
+
     Args:
-        collections: List of Collection objects to write.
+        collections: Iterable of Collection objects to write.
         filename: Output filename (default: from OUTPUT_FILENAME constant).
     """
-    ics = _build_ics(collections)
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(ics)
+    data = "".join(_build_ics(collections)).encode("utf-8")
+
+    # Write to a temporary file alongside the target and only replace the old
+    # calendar once the whole document has been written. The file is opened
+    # in binary mode, so the CRLF line endings are kept as they are. A symlink
+    # is resolved first so the file it points to is the one replaced.
+    target = os.path.realpath(filename)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(target),
+        prefix=f".{os.path.basename(target)}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        _copy_file_permissions(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
     logger.info("iCalendar file written to %s", filename)
 
 
@@ -303,13 +678,44 @@ def print_collections(collections: list[Collection]) -> None:
     Args:
         collections: List of Collection objects to print.
     """
-    if not collections:
-        logger.warning("No collections to display")
-        return
+    for _ in filter_and_print(collections, frozenset()):
+        pass
+
+
+def filter_and_print(
+    collections: Iterable[Collection], disabled: frozenset[str]
+) -> Iterator[Collection]:
+    """Yield the enabled collections, printing each one to stdout.
+
+    Collections are filtered on the ``INCLUDE_*`` settings as they pass
+    through, so filtering, printing and writing the calendar share one pass.
+
+    Args:
+        collections: Iterable of Collection objects to filter.
+        disabled: Names of the collection types to leave out.
+
+    Yields:
+        The collections that are enabled.
+    """
+    kept = filtered = 0
 
-    logger.info("Upcoming waste collections:")
     for c in collections:
+        if c.type in disabled:
+            filtered += 1
+            continue
+        if not kept:
+            logger.info("Upcoming waste collections:")
         print(f"{c.date:%Y-%m-%d} - {c.type}")
+        kept += 1
+        yield c
+
+    if filtered > 0:
+        logger.info(
+            "Filtered out %d collection(s) based on INCLUDE_* settings",
+            filtered,
+        )
+    if not kept:
+        logger.warning("No collections to display")
 
 
 def validate_environment() -> tuple[str | None, str | None, str | None]:
@@ -346,38 +752,31 @@ def main() -> None:
     This is the main entry point for the application. It:
     1. Validates environment variables
     2. Fetches collection data from Cornwall Council
-    3. Filters collections based on user preferences
-    4. Prints collection dates to stdout
-    5. Generates an iCalendar (.ics) file
+    3. Filters collections based on user preferences, printing each date to
+       stdout and writing it to an iCalendar (.ics) file in a single pass
 
     Exits with status code 1 on error.
     """
     try:
         # Validate environment and get configuration
         uprn, postcode, house = validate_environment()
+        disabled = _disabled_collections()
         logger.info("Starting Cornwall waste collection calendar generator")
 
-        # Fetch collection data
-        source = Source(uprn=uprn, postcode=postcode, housenumberorname=house)
-        collections = source.fetch()
+        # Fetch collection data, going straight to the collection page when the
+        # UPRN is already known
+        if uprn:
+            collections = fetch_by_uprn(uprn)
+        else:
+            source = Source(postcode=postcode, housenumberorname=house)
+            collections = source.fetch()
 
         if not collections:
             logger.warning("No collections found")
             return
 
-        # Filter based on user preferences
-        original_count = len(collections)
-        collections = [c for c in collections if _is_enabled(c.type)]
-        filtered_count = original_count - len(collections)
-        if filtered_count > 0:
-            logger.info(
-                "Filtered out %d collection(s) based on INCLUDE_* settings",
-                filtered_count,
-            )
-
-        # Display and save results
-        print_collections(collections)
-        write_ics_file(collections)
+        # Filter, display and save results in a single pass
+        write_ics_file(filter_and_print(collections, disabled))
 
         logger.info("Processing complete")
 